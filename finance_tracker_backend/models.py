@@ -1,8 +1,13 @@
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import func
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
 
 db = SQLAlchemy()
+password_hasher = PasswordHasher()
+
+VALID_TX_TYPES = frozenset({'income', 'expense', 'savings', 'investment'})
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -11,18 +16,29 @@ class User(db.Model):
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
     password_hash = db.Column(db.String(255), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
     
     # Relationship with transactions
     transactions = db.relationship('Transaction', backref='user', lazy=True, cascade='all, delete-orphan')
     
     def set_password(self, password):
-        """Hash and set password"""
-        self.password_hash = generate_password_hash(password)
+        """Hash and set password (Argon2id)"""
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
         """Verify password"""
-        return check_password_hash(self.password_hash, password)
+        if not self.password_hash.startswith('$argon2'):
+            # Legacy Werkzeug PBKDF2 hash from before the switch to Argon2
+            return check_password_hash(self.password_hash, password)
+        try:
+            return password_hasher.verify(self.password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    
+    def password_needs_rehash(self):
+        """True if the stored hash is legacy or uses outdated Argon2 parameters"""
+        return (not self.password_hash.startswith('$argon2')
+                or password_hasher.check_needs_rehash(self.password_hash))
     
     def to_dict(self):
         """Convert user object to dictionary"""
@@ -30,21 +46,31 @@ class User(db.Model):
             'id': self.id,
             'name': self.name,
             'email': self.email,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
 
 class Transaction(db.Model):
     __tablename__ = 'transactions'
+    __table_args__ = (
+        # Serves WHERE user_id = ? ORDER BY date DESC without a sort step
+        db.Index('ix_tx_user_date', 'user_id', db.text('date DESC')),
+        # Serves per-user filtering by type (stats by category)
+        db.Index('ix_tx_user_type', 'user_id', 'type'),
+        db.CheckConstraint(
+            'type IN (%s)' % ', '.join(f"'{t}'" for t in sorted(VALID_TX_TYPES)),
+            name='ck_tx_type'
+        ),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     type = db.Column(db.String(20), nullable=False, index=True)  # income, expense, savings, investment
     category = db.Column(db.String(50), nullable=False, index=True)
-    amount = db.Column(db.Numeric(15, 2), nullable=False)
-    date = db.Column(db.Date, nullable=False, index=True)
+    amount_cents = db.Column(db.BigInteger, nullable=False)  # amount in cents
+    date = db.Column(db.Date, nullable=False)
     description = db.Column(db.String(200))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime(timezone=True), server_default=func.now())
     
     def to_dict(self):
         """Convert transaction object to dictionary"""
@@ -53,11 +79,18 @@ class Transaction(db.Model):
             'user_id': self.user_id,
             'type': self.type,
             'category': self.category,
-            'amount': float(self.amount),
+            'amount': self.amount_cents / 100,
             'date': self.date.isoformat(),
             'description': self.description,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at.isoformat() if self.created_at else None
         }
     
+    @classmethod
+    def dict_columns(cls):
+        """Columns matching to_dict() keys, for selecting rows without building ORM objects"""
+        return (cls.id, cls.user_id, cls.type, cls.category,
+                (db.cast(cls.amount_cents, db.Float) / 100).label('amount'),
+                cls.date, cls.description, cls.created_at)
+    
     def __repr__(self):
-        return f'<Transaction {self.id}: {self.type} - ${self.amount}>'
+        return f'<Transaction {self.id}: {self.type} - ${self.amount_cents / 100:.2f}>'